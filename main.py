@@ -1,6 +1,5 @@
 import logging
 import time
-import json
 from typing import List
 
 from traffic_analyzer import TrafficAnalyzer
@@ -16,29 +15,40 @@ def main(file_paths: List[str]) -> None:
     log.info("Paths: %s", file_paths)
     log.info("")
 
-    ta = TrafficAnalyzer()
-    ta.add_paths(file_paths)
+    try:
+        ta = TrafficAnalyzer()
+        ta.add_paths(file_paths)
 
-    total = ta.total()
-    days = ta.per_day()
-    top3 = ta.top_k(k=3)
-    min_window = ta.min_window_sum()
+        total = ta.total()
+        days = ta.per_day()
+        top3 = ta.top_k(k=3)
+        min_window = ta.min_window_sum()
+
+    except Exception:
+        # Expected failures are absorbed by the analyzer; anything else is a bug
+        log.exception("traffic analysis failed")
+        raise SystemExit(1)
 
     # Pretty summary
     log.info("--- Summary --------------------------------------------------")
     log.info("Total cars: %s", total)
     log.info("")
     log.info("Per-day totals:")
-    log.info("\n%s", json.dumps(days, indent=2, ensure_ascii=False))
+    for day in days:
+        log.info("  %s  %s", day["date"], day["total_cars"])
 
     log.info("\n----------------------------------------------------------")
     
     log.info("Top 3 half-hours:")
-    log.info("\n%s", json.dumps(top3, indent=2, ensure_ascii=False))
+    for row in top3:
+        log.info("  %s  %s", row["datetime"], row["count"])
     
     log.info("\n----------------------------------------------------------")
     log.info("Least 1.5h window:")
-    log.info("\n%s", json.dumps(min_window, indent=2, ensure_ascii=False))
+    if min_window:
+        log.info("  Sum: %s", min_window["total_cars"])
+        for ts in min_window["datetime_range"]:
+            log.info("  %s", ts)
 
 
     # End banner
@@ -50,6 +60,6 @@ def main(file_paths: List[str]) -> None:
 
 
 if __name__ == "__main__":
-    default_paths = ["./traffic_logs/traffic.logs"]
+    default_paths = ["./traffic_logs/*.logs"]
     main(default_paths)
 
@@ -73,6 +73,49 @@ class TestCore(unittest.TestCase):
             ],
         )
 
+    def test_add_paths_after_query_appends_rows(self):
+        self.assertEqual(self.ta.total(), 398)
+        self.ta.add_paths([self.temp_path, self.temp_path])
+        self.assertEqual(self.ta.total(), 3 * 398)
+        self.assertEqual(self.ta.per_day()[0], {"date": "2021-12-01", "total_cars": 3 * 179})
+
+    def test_add_paths_expands_glob_patterns(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("a.logs", "b.logs", "notes.txt"):
+                with open(os.path.join(tmp, name), "w", encoding="utf-8") as f:
+                    f.write(SAMPLE)
+            ta = TrafficAnalyzer()
+            ta.add_paths([os.path.join(tmp, "*.logs")])
+            self.assertEqual(ta.total(), 2 * 398)
+
+    def test_add_paths_reads_bracketed_literal_filename(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "log[1].logs")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(SAMPLE)
+            ta = TrafficAnalyzer()
+            ta.add_paths([path])
+            self.assertEqual(ta.total(), 398)
+
+    def test_add_paths_warns_when_pattern_matches_nothing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            pattern = os.path.join(tmp, "*.logs")
+            ta = TrafficAnalyzer()
+            with self.assertLogs("traffic_analyzer.TrafficAnalyzer", level="WARNING") as logs:
+                ta.add_paths([pattern])
+            self.assertIn(f"no files match {pattern}", logs.output[0])
+            self.assertEqual(ta.total(), 0)
+
+    def test_top_k_ties_break_by_datetime(self):
+        # Three rows hold 15 cars; only the two earliest fit in the top 11
+        self.assertEqual(
+            self.ta.top_k(11)[-2:],
+            [
+                {"datetime": "2021-12-01T06:30:00", "count": 15},
+                {"datetime": "2021-12-05T10:30:00", "count": 15},
+            ],
+        )
+
     def test_min_window_sum(self):
         result = self.ta.min_window_sum()
         self.assertEqual(result["total_cars"], 31)
@@ -86,6 +129,44 @@ class TestCore(unittest.TestCase):
         )
 
 
+class TestMinWindowEdges(unittest.TestCase):
+    def analyzer_for(self, text):
+        fd, path = tempfile.mkstemp(text=True)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        self.addCleanup(os.remove, path)
+        ta = TrafficAnalyzer()
+        ta.add_paths([path])
+        return ta
+
+    def test_no_contiguous_window(self):
+        ta = self.analyzer_for(
+            "2021-12-05T09:30:00 18\n"
+            "2021-12-05T10:30:00 15\n"
+            "2021-12-05T11:30:00 7\n"
+        )
+        self.assertEqual(ta.min_window_sum(), {})
+
+    def test_unsorted_rows_give_chronological_range(self):
+        ta = self.analyzer_for(
+            "2021-12-01T06:00:00 3\n"
+            "2021-12-01T05:00:00 1\n"
+            "2021-12-01T05:30:00 2\n"
+            "2021-12-01T06:30:00 9\n"
+        )
+        self.assertEqual(
+            ta.min_window_sum(),
+            {
+                "datetime_range": [
+                    "2021-12-01T05:00:00",
+                    "2021-12-01T05:30:00",
+                    "2021-12-01T06:00:00",
+                ],
+                "total_cars": 6,
+            },
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
 
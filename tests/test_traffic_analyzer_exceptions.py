@@ -1,20 +1,32 @@
+import importlib
+import logging
+import os
+import tempfile
 import unittest
+from unittest import mock
+
+import numpy as np
+
+import main
 from traffic_analyzer import TrafficAnalyzer
 
 
-class FaultySelect:
-    def select(self, *args, **kwargs):
-        raise RuntimeError("boom-select")
+analyzer_module = importlib.import_module("traffic_analyzer.TrafficAnalyzer")
+
 
+def boom(*args, **kwargs):
+    raise ValueError("boom-analyze")
 
-class FaultyWithColumns:
-    def with_columns(self, *args, **kwargs):
-        raise RuntimeError("boom-with_columns")
 
+def bug(*args, **kwargs):
+    raise IndexError("bug-analyze")
 
-class FaultySort:
-    def sort(self, *args, **kwargs):
-        raise RuntimeError("boom-sort")
+
+def loaded_analyzer() -> TrafficAnalyzer:
+    ta = TrafficAnalyzer()
+    ta._dt_ns = np.array([0], dtype=np.int64)
+    ta._count = np.array([1], dtype=np.int64)
+    return ta
 
 
 class TestTrafficAnalyzerExceptions(unittest.TestCase):
@@ -35,28 +47,60 @@ class TestTrafficAnalyzerExceptions(unittest.TestCase):
         # Should still be able to call methods and get safe defaults
         self.assertEqual(ta.total(), 0)
 
+    def test_bad_path_does_not_drop_good_paths(self):
+        fd, path = tempfile.mkstemp(text=True)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("2021-12-01T05:00:00 5\n2021-12-01T05:30:00 12\n")
+        try:
+            ta = TrafficAnalyzer()
+            ta.add_paths([path, "/does/not/exist.logs", path])
+            self.assertEqual(ta.total(), 34)
+        finally:
+            os.remove(path)
+
+    @mock.patch.object(analyzer_module, "_analyze", boom)
     def test_total_handles_internal_exception(self):
-        ta = TrafficAnalyzer()
-        ta.lf = FaultySelect()  # type: ignore[assignment]
-        self.assertEqual(ta.total(), 0)
+        self.assertEqual(loaded_analyzer().total(), 0)
 
+    @mock.patch.object(analyzer_module, "_analyze", boom)
     def test_per_day_handles_internal_exception(self):
-        ta = TrafficAnalyzer()
-        ta.lf = FaultyWithColumns()  # type: ignore[assignment]
-        self.assertEqual(ta.per_day(), [])
+        self.assertEqual(loaded_analyzer().per_day(), [])
 
+    @mock.patch.object(analyzer_module, "_top_indices", boom)
     def test_top_k_handles_internal_exception(self):
-        ta = TrafficAnalyzer()
-        ta.lf = FaultySort()  # type: ignore[assignment]
-        self.assertEqual(ta.top_k(3), [])
+        self.assertEqual(loaded_analyzer().top_k(3), [])
+
+    def test_top_k_rejects_non_integer_k(self):
+        ta = loaded_analyzer()
+        for k in ("3", 2.0, None):
+            self.assertEqual(ta.top_k(k), [])  # type: ignore[arg-type]
 
+    @mock.patch.object(analyzer_module, "_analyze", boom)
     def test_min_window_sum_handles_internal_exception(self):
-        ta = TrafficAnalyzer()
-        ta.lf = FaultySort()  # type: ignore[assignment]
-        self.assertEqual(ta.min_window_sum(), {})
+        self.assertEqual(loaded_analyzer().min_window_sum(), {})
+
+    @mock.patch.object(analyzer_module, "_analyze", boom)
+    def test_expected_failure_logs_warning_without_traceback(self):
+        with self.assertLogs(analyzer_module.logger, level=logging.WARNING) as logs:
+            self.assertEqual(loaded_analyzer().total(), 0)
+        self.assertEqual(logs.records[0].levelno, logging.WARNING)
+        self.assertFalse(logs.records[0].exc_info)
+
+    @mock.patch.object(analyzer_module, "_analyze", bug)
+    def test_unexpected_error_propagates(self):
+        with self.assertRaises(IndexError):
+            loaded_analyzer().total()
+
+    @mock.patch.object(analyzer_module, "_analyze", bug)
+    @mock.patch.object(main, "TrafficAnalyzer", loaded_analyzer)
+    @mock.patch.object(main.logging, "basicConfig")
+    def test_main_exits_non_zero_on_unexpected_error(self, _basic_config):
+        with self.assertLogs("traffic", level=logging.ERROR) as logs:
+            with self.assertRaises(SystemExit) as ctx:
+                main.main([])
+        self.assertEqual(ctx.exception.code, 1)
+        self.assertIsNotNone(logs.records[0].exc_info)
 
 
 if __name__ == "__main__":
     unittest.main()
-
-
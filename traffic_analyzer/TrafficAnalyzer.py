@@ -1,63 +1,273 @@
+import glob
 import logging
-from datetime import timedelta
-from typing import List, Optional
+import operator
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 
+import numpy as np
 import polars as pl
 
 logger = logging.getLogger(__name__)
 
+HALF_HOUR_NS = 30 * 60 * 1_000_000_000
+DAY_NS = 24 * 60 * 60 * 1_000_000_000
+INT64_MAX = np.iinfo(np.int64).max
+
+# Failures the analyzer reports as a warning and answers with a safe default;
+# anything else (e.g. an IndexError in the analysis) is a bug and propagates
+EXPECTED_ERRORS = (pl.exceptions.PolarsError, OSError, ValueError)
+# Reading also rejects non-path objects (e.g. an int) with a TypeError
+READ_ERRORS = EXPECTED_ERRORS + (TypeError,)
+DT_FORMAT = "%Y-%m-%dT%H:%M:%S"
+GLOB_CHARS = frozenset("*?[")
+
+
+def _warn(msg: str, *args) -> None:
+
+    """Log an expected failure on one line; attach the traceback only at DEBUG."""
+
+    logger.warning(msg, *args, exc_info=logger.isEnabledFor(logging.DEBUG))
+
+
+# (total, dates, day_totals, window_range, window_sum), already formatted
+Analysis = Tuple[int, List[str], List[int], List[str], int]
+
+
+def _analyze(dt_ns: np.ndarray, count: np.ndarray) -> Analysis:
+
+    """Compute every dt-ordered aggregate over the columns in one call.
+
+    The columns must already be sorted by dt (see `_sort_columns`).
+    Results come back as plain Python values, formatted once here rather
+    than on every query: (total, dates, day_totals, window_range,
+    window_sum) where dates are YYYY-MM-DD strings and window_range holds the
+    three ISO timestamps of the least-cars contiguous window (empty when none
+    exists).
+    """
+
+    # Per-day sums keyed by whole days since the epoch; rows are dt-sorted so
+    # each day is one contiguous run and reduceat sums the runs directly
+    day = dt_ns // DAY_NS
+    starts = np.flatnonzero(day[1:] != day[:-1]) + 1
+    starts = np.concatenate(([0], starts)) if day.size else starts
+    day_keys = day[starts]
+    day_sums = np.add.reduceat(count, starts) if starts.size else count[:0]
+
+    # The grand total reuses the per-day sums instead of another full pass
+    total = int(day_sums.sum())
+
+    # Score every 3-row window, masking out those that are not strictly
+    # contiguous (+30m then +30m) so a single argmin finds the least-cars one;
+    # argmin keeps the earliest window on ties
+    window_range: List[str] = []
+    window_sum = 0
+    if dt_ns.size >= 3:
+        half_hour = np.diff(dt_ns) == HALF_HOUR_NS
+        contiguous = half_hour[:-1] & half_hour[1:]
+        # Accumulate in place: one window-sum buffer instead of four temporaries
+        sums = np.add(count[:-2], count[1:-1])
+        sums += count[2:]
+        sums[~contiguous] = INT64_MAX
+        best = int(np.argmin(sums))
+        if contiguous[best]:
+            window_range = _iso(dt_ns[best:best + 3])
+            window_sum = int(sums[best])
+
+    dates = np.datetime_as_string(day_keys.astype("datetime64[D]")).tolist()
+    return total, dates, day_sums.tolist(), window_range, window_sum
+
+
+def _top_indices(dt_ns: np.ndarray, count: np.ndarray, k: int) -> np.ndarray:
+
+    """Return row indices of the k largest counts (count desc, dt asc).
+
+    The columns must already be sorted by dt (see `_sort_columns`), so rows
+    tied on count are already in datetime order.
+    """
+
+    n = count.size
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k >= n:
+        return np.lexsort((dt_ns, -count))
+
+    # Partition to the k-th largest count. Fewer than k rows beat it; the
+    # remaining slots go to the earliest rows tied with it. Only those k
+    # rows are ordered, however many rows share the threshold.
+    threshold = np.partition(count, n - k)[n - k]
+    above = np.flatnonzero(count > threshold)
+    tied = np.flatnonzero(count == threshold)[:k - above.size]
+    candidates = np.concatenate((above, tied))
+    order = np.lexsort((dt_ns[candidates], -count[candidates]))
+    return candidates[order]
+
+
+def _read_log(path: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+
+    """Parse one log file into (dt_ns, count) columns, or None if it cannot be read.
+
+    Rows that fail to parse are dropped. Polars runs the parse outside the
+    GIL, so several files can be read concurrently from worker threads.
+    """
+
+    try:
+        df = (
+            pl.scan_csv(
+                path,
+                has_header=False,
+                separator=" ",
+                new_columns=["dt", "count"],
+                ignore_errors=True,
+                schema_overrides={"dt": pl.Utf8, "count": pl.Int64},
+                # Patterns are expanded by add_paths; take each path literally
+                glob=False,
+            )
+            # Parse with the fixed log format straight to int64 epoch ns; every
+            # timestamp in a log is distinct, so the strptime cache only costs
+            .select(
+                pl.col("dt").str.to_datetime(DT_FORMAT, strict=False, cache=False).dt.epoch("ns"),
+                pl.col("count"),
+            )
+            .drop_nulls()
+            .collect()
+        )
+
+        # A single-chunk Int64 series converts to NumPy without a copy; larger
+        # files come back in several chunks and are copied once here
+        return df.get_column("dt").to_numpy(), df.get_column("count").to_numpy()
+
+    except READ_ERRORS as exc:
+        _warn("failed to read %s: %s", path, exc)
+        return None
+
+
+def _join_column(parts: List[np.ndarray]) -> np.ndarray:
+
+    """Concatenate column parts into one int64 array, skipping the copy for one part."""
+
+    if len(parts) == 1:
+        return parts[0].astype(np.int64, copy=False)
+    return np.concatenate(parts).astype(np.int64, copy=False)
+
+
+def _sort_columns(dt_ns: np.ndarray, count: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+
+    """Return both columns ordered by dt, keeping input order among equal dt.
+
+    Logs are normally written chronologically, so the O(N) sortedness check
+    usually lets both columns through untouched.
+    """
+
+    if dt_ns.size < 2 or (dt_ns[1:] >= dt_ns[:-1]).all():
+        return dt_ns, count
+
+    order = np.argsort(dt_ns, kind="stable")
+    return dt_ns[order], count[order]
+
+
+def _iso(dt_ns: np.ndarray) -> List[str]:
+
+    """Format epoch nanoseconds as ISO-8601 second-resolution strings.
+
+    Callers pass only the rows they return, so no other row is formatted.
+    """
+
+    return np.datetime_as_string(dt_ns.astype("datetime64[ns]"), unit="s").tolist()
+
 
 class TrafficAnalyzer:
 
-    """Analyze half-hour traffic logs using a Polars LazyFrame pipeline.
+    """Analyze half-hour traffic logs using columnar NumPy arrays.
 
     Overview
-    - This class avoids loading everything into memory up-front. Instead, it
-      builds a lazy query from one or more CSV sources (added via `add_paths`).
-      Each public method composes transformations and collects only the minimal
+    - `add_paths` only queues paths. The first query parses all pending
+      files in parallel, once, into two flat columns: timestamps as int64
+      epoch nanoseconds and car counts as int64.
+    - A single analysis pass over those columns is memoized; every public
+      method is a thin formatter over that result.
 
     Expected schema per row
-    - dt: pl.Datetime (the half-hour timestamp)
-    - count: pl.Int64 (number of cars in that half-hour)
+    - dt: ISO-8601 timestamp (the half-hour)
+    - count: integer (number of cars in that half-hour)
 
     Error handling
-    - All public methods catch exceptions, log them, and return a safe default:
+    - All public methods catch expected failures (unreadable files, parse and
+      value errors), log a one-line warning, and return a safe default:
       total() -> 0, per_day()/top_k() -> [], min_window_sum() -> {}.
+      Tracebacks are attached only when DEBUG logging is enabled.
     """
 
     def __init__(self) -> None:
         """Create an empty analyzer with no data yet."""
 
-        self.lf: Optional[pl.LazyFrame] = None
+        self._pending: List[str] = []
+        self._dt_ns: Optional[np.ndarray] = None
+        self._count: Optional[np.ndarray] = None
+        self._analysis: Optional[Analysis] = None
 
     def add_paths(self, paths: List[str]) -> None:
 
-        """Add CSV file paths lazily (no immediate read).
+        """Add CSV file paths or glob patterns lazily (no immediate read).
 
-        Each path is added as a scan_csv LazyFrame and concatenated to the
-        pipeline. Downstream queries will filter/transform/collect as needed.
+        Patterns such as "traffic_logs/*.logs" are expanded to their matching
+        files in sorted order; a path naming an existing file is never
+        treated as a pattern. Paths are queued and parsed together, in
+        parallel, on the next query (see `_materialize`).
         """
-        
+
         try:
             for p in paths:
-                scan = pl.scan_csv(
-                    p,
-                    has_header=False,
-                    separator=" ",
-                    new_columns=["dt", "count"],
-                    ignore_errors=True,
-                    schema_overrides={"dt": pl.Datetime, "count": pl.Int64},
-                )
-        
-                if self.lf is None:
-                    self.lf = scan
-        
+                # Existing files are taken literally, even if their name
+                # contains glob characters such as "log[1].logs"
+                if isinstance(p, str) and not os.path.exists(p) and GLOB_CHARS.intersection(p):
+                    matches = sorted(glob.glob(p, recursive=True))
+                    if not matches:
+                        logger.warning("no files match %s", p)
+                    self._pending.extend(matches)
                 else:
-                    self.lf = pl.concat([self.lf, scan], how="vertical_relaxed")
-        
-        except Exception as exc:
-            logger.exception("failed to add paths: %s", exc)
+                    self._pending.append(p)
+
+        except TypeError as exc:
+            _warn("failed to add paths: %s", exc)
+
+    def _materialize(self) -> None:
 
+        """Parse pending paths in parallel and append their rows to the columns.
+
+        A path that cannot be read is logged and skipped without affecting the
+        others. Any previously memoized analysis is discarded so the next query
+        reflects the new data.
+        """
+
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, []
+        if len(pending) == 1:
+            parsed = [_read_log(pending[0])]
+        else:
+            with ThreadPoolExecutor() as pool:
+                parsed = list(pool.map(_read_log, pending))
+
+        dt_parts = [] if self._dt_ns is None else [self._dt_ns]
+        count_parts = [] if self._count is None else [self._count]
+        for columns in parsed:
+            if columns is not None:
+                dt_parts.append(columns[0])
+                count_parts.append(columns[1])
+
+        if dt_parts:
+            self._dt_ns, self._count = _sort_columns(_join_column(dt_parts), _join_column(count_parts))
+            self._analysis = None
+
+    def _analyzed(self) -> Analysis:
+
+        """Run the analysis pass on first use and return the memoized result."""
+
+        if self._analysis is None:
+            self._analysis = _analyze(self._dt_ns, self._count)
+        return self._analysis
 
     def total(self) -> int:
 
@@ -67,15 +277,16 @@ class TrafficAnalyzer:
         """
 
         try:
-            if self.lf is None:
+            self._materialize()
+            if self._dt_ns is None:
                 logger.warning("no data loaded: returning total=0")
                 return 0
-            
-            result = self.lf.select(pl.col("count").sum()).collect()
-            return int(result.item() or 0)
 
-        except Exception as exc:
-            logger.exception("failed to compute total: %s", exc)
+            total, _, _, _, _ = self._analyzed()
+            return total
+
+        except EXPECTED_ERRORS as exc:
+            _warn("failed to compute total: %s", exc)
             return 0
 
     def per_day(self) -> List[dict]:
@@ -86,24 +297,20 @@ class TrafficAnalyzer:
         """
         try:
 
-            if self.lf is None:
+            self._materialize()
+            if self._dt_ns is None:
                 logger.warning("no data loaded: returning empty per_day")
                 return []
-                
-            result = (
-                self.lf
-                    .with_columns(pl.col("dt").dt.strftime("%Y-%m-%d").alias("date"))
-                    .group_by("date")
-                    .agg(pl.col("count").sum().alias("total_cars"))
-                    .sort("date")
-                    .select(["date", "total_cars"])  # project minimal columns
-                    .collect()
-            )
-            
-            return result.to_dicts()
-        
-        except Exception as exc:
-            logger.exception("failed to compute per_day: %s", exc)
+
+            _, dates, day_totals, _, _ = self._analyzed()
+
+            return [
+                {"date": date, "total_cars": cars}
+                for date, cars in zip(dates, day_totals)
+            ]
+
+        except EXPECTED_ERRORS as exc:
+            _warn("failed to compute per_day: %s", exc)
             return []
 
     def top_k(self, k: int = 3) -> List[dict]:
@@ -111,32 +318,37 @@ class TrafficAnalyzer:
         """Return the top-k half-hour windows by car count.
 
         Output shape: list of dicts with keys {"datetime", "count"}.
-        Sorted by count desc, then datetime asc. Safe default: [].
+        Sorted by count desc, then datetime asc. Safe default: [], also
+        when k is not an integer.
         """
-        
+
         try:
-        
-            if self.lf is None:
+            k = operator.index(k)
+
+        except TypeError as exc:
+            _warn("invalid k for top_k: %s", exc)
+            return []
+
+        try:
+
+            self._materialize()
+            if self._dt_ns is None:
                 logger.warning("no data loaded: returning empty top_k")
                 return []
-        
-            out = (
-                self.lf
-                    .sort(by=["count"], descending=[True])
-                    .with_columns(pl.col("dt").dt.strftime("%Y-%m-%dT%H:%M:%S").alias("datetime"))
-                    .select(["datetime", "count"])
-                    .head(k)
-                    .collect()
-            )
-        
-            return out.to_dicts()
-        
-        except Exception as exc:
-            logger.exception("failed to compute top_k: %s", exc)
+
+            idx = _top_indices(self._dt_ns, self._count, k)
+
+            return [
+                {"datetime": dt, "count": cars}
+                for dt, cars in zip(_iso(self._dt_ns[idx]), self._count[idx].tolist())
+            ]
+
+        except EXPECTED_ERRORS as exc:
+            _warn("failed to compute top_k: %s", exc)
             return []
-        
+
     def min_window_sum(self) -> dict:
-        
+
         """Return the 1.5-hour contiguous window with the least cars.
 
         Contiguity definition: three rows where dt increments exactly by
@@ -145,48 +357,23 @@ class TrafficAnalyzer:
           - "total_cars": integer sum over those three rows
         Safe default: {} when no data or on error.
         """
-        
+
         try:
-            if self.lf is None:
+            self._materialize()
+            if self._dt_ns is None:
                 logger.warning("no data loaded: returning empty min_window_sum")
                 return {}
-            result = (
-                self.lf
-                .sort("dt")
-                .with_columns([
-                    pl.col("dt").shift(-1).alias("dt1"),
-                    pl.col("dt").shift(-2).alias("dt2"),
-                    pl.col("count").shift(-1).alias("count1"),
-                    pl.col("count").shift(-2).alias("count2"),
-                ])
-                # Keep only strictly contiguous half-hours: +30m then +30m
-                .filter(
-                    ((pl.col("dt1") - pl.col("dt")) == timedelta(minutes=30)) &
-                    ((pl.col("dt2") - pl.col("dt1")) == timedelta(minutes=30))
-                )
-                # Sum the three consecutive counts
-                .with_columns(
-                    (pl.col("count") + pl.col("count1") + pl.col("count2")).alias("sum_count")
-                )
-                .select(["dt", "dt1", "dt2", "sum_count"])
-                .sort("sum_count")
-                .limit(1)
-                .collect()
-            )
 
-            rows = result.to_dicts()
-            formatted_result = {}
-
-            if rows:
-                row = rows[0]
-                # Keep datetimes in natural [dt, dt1, dt2] order for readability
-                formatted_result = {
-                    "datetime_range": [datetime.isoformat() for key, datetime in row.items() if 'dt' in key],
-                    "total_cars": row["sum_count"],
-                }
-
-            return formatted_result
-            
-        except Exception as exc:
-            logger.exception("failed to compute min_window_sum: %s", exc)
-            return {}
\ No newline at end of file
+            _, _, _, window_range, window_sum = self._analyzed()
+
+            if not window_range:
+                return {}
+
+            return {
+                "datetime_range": list(window_range),
+                "total_cars": window_sum,
+            }
+
+        except EXPECTED_ERRORS as exc:
+            _warn("failed to compute min_window_sum: %s", exc)
+            return {}